@@ -7,18 +7,107 @@ import discord
 from discord.ext import commands, tasks
 import aiohttp
 import asyncio
-import json
+import orjson
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 import re
-import hashlib
+import logging
+import queue
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
 
 load_dotenv()
 
+logger = logging.getLogger('cs2_update_bot')
+
 # Bot Configuration
-DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
-UPDATE_CHANNEL_ID = int(os.getenv('UPDATE_CHANNEL_ID', 0))
+DISCORD_TOKEN = os.getenv('DISCORD_TOKEN', '').strip()
+_channel_id = os.getenv('UPDATE_CHANNEL_ID', '').strip()
+
+# Fail fast on a misconfigured environment instead of after connecting to Discord
+if not DISCORD_TOKEN:
+    raise SystemExit("❌ DISCORD_TOKEN is not set")
+if not _channel_id.isdigit() or int(_channel_id) == 0:
+    raise SystemExit("❌ UPDATE_CHANNEL_ID is not set or is not a valid channel ID")
+
+UPDATE_CHANNEL_ID = int(_channel_id)
+
+# Length of the news summary; Steam truncates contents server-side to match
+NEWS_SUMMARY_LENGTH = 500
+
+# Monitored upstream endpoints (CS2 App ID: 730)
+STEAM_DEPOT_URL = "https://api.steamcmd.net/v1/info/730"
+STEAM_NEWS_URL = f"https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/?appid=730&count=5&maxlength={NEWS_SUMMARY_LENGTH}&format=json"
+STEAMDB_URL = "https://steamdb.info/api/GetAppHistoryItems/"
+
+TRACKED_DATA_FILE = 'tracked_updates.json'
+SAVE_DEBOUNCE_SECONDS = 2
+MAX_TRACKED_IDS = 50
+# Per-source fetch timeout inside a polling tick
+SOURCE_TIMEOUT_SECONDS = 20
+# Consecutive failed polls that open a source's circuit, and how many scheduled polls it then skips
+_CIRCUIT_FAILURE_THRESHOLD = 3
+_CIRCUIT_OPEN_POLLS = 2
+# Embeds waiting to be posted; pollers block only once this many are queued
+SEND_QUEUE_SIZE = 100
+# Minimum spacing between posts, under Discord's 5 messages / 5 seconds per-channel limit
+SEND_INTERVAL_SECONDS = 1.1
+# How long shutdown waits for a running polling tick, and then for queued embeds to be posted
+SEND_DRAIN_TIMEOUT_SECONDS = 30
+
+# HTTP client settings; keep-alive must outlive the longest poll interval (15 minutes)
+HTTP_KEEPALIVE_SECONDS = 1200
+HTTP_TIMEOUT_SECONDS = 30
+# Transient upstream statuses retried within one poll; delays stay well inside the source timeout
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_RETRY_ATTEMPTS = 3
+HTTP_RETRY_MAX_DELAY = 8
+# Largest response body accepted from an upstream API
+MAX_RESPONSE_BYTES = 1_048_576
+USER_AGENT = 'CS2UpdateTracker/1.0 (+https://github.com/ItsSleepy/Discord-CS-Bot)'
+
+# BBCode tags and HTML tags stripped from news contents in a single pass
+MARKUP_RE = re.compile(r'\[.*?\]|<[^>]*>')
+
+def setup_logging():
+    """Route all log records through a queue so stream writes happen off the event loop"""
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+@dataclass(slots=True)
+class BotState:
+    """Per-instance bookkeeping shared by the polling, saving and sending tasks"""
+    tracked_data: dict
+    # Hashed shadows of the bounded ID deques for O(1) membership checks
+    seen_news: set
+    seen_changes: set
+    # Conditional GET validators (ETag / Last-Modified) keyed by URL
+    http_meta: dict
+    # Circuit breaker state keyed by endpoint URL
+    breakers: dict
+    # Polling tick (poll_sources.current_loop) at which each source is next due
+    next_poll: dict
+    # Pollers enqueue embeds; a single sender posts them to Discord
+    send_queue: asyncio.Queue
+    # Resolved update channel
+    channel: Optional[discord.TextChannel] = None
+    # Unknown until the first depot poll shows whether HEAD returns an ETag
+    depot_head_supported: Optional[bool] = None
 
 class CS2UpdateBot(commands.Bot):
     def __init__(self):
@@ -32,47 +121,291 @@ class CS2UpdateBot(commands.Bot):
         )
         
         self.session = None
-        self.tracked_data = self.load_tracked_data()
+        # Set whenever tracked_data changes; the save worker coalesces writes
+        self._save_dirty = asyncio.Event()
+        self._save_task = None
+        self._pending_write = None
+        self._sender_task = None
+        # Held for the whole of a polling tick so shutdown can wait for it to finish
+        self._poll_lock = asyncio.Lock()
+        
+        # Polling interval (minutes, i.e. poll_sources ticks), endpoint and fetcher for each source
+        self.sources = {
+            'Steam Depot': (5, STEAM_DEPOT_URL, self.fetch_steam_depot),
+            'Steam News': (10, STEAM_NEWS_URL, self.fetch_steam_news),
+            'SteamDB': (15, STEAMDB_URL, self.fetch_steamdb)
+        }
+        
+        tracked_data = self.load_tracked_data()
+        self.state = BotState(
+            tracked_data=tracked_data,
+            seen_news=set(tracked_data['steam_news']),
+            seen_changes=set(tracked_data['steamdb_changes']),
+            http_meta=tracked_data.setdefault('http_meta', {}),
+            breakers={
+                url: {'fails': 0, 'skip': 0}
+                for interval, url, fetch in self.sources.values()
+            },
+            # First polls on ticks 0, 1, 2: with 5/10/15 minute intervals the sources never share a tick
+            next_poll={name: offset for offset, name in enumerate(self.sources)},
+            send_queue=asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        )
         
     def load_tracked_data(self):
         """Load previously tracked update hashes"""
         try:
-            with open('tracked_updates.json', 'r') as f:
-                return json.load(f)
+            with open(TRACKED_DATA_FILE, 'rb') as f:
+                data = orjson.loads(f.read())
         except FileNotFoundError:
-            return {
+            data = {
                 'steam_depot': {},
                 'reddit_posts': [],
                 'twitter_posts': [],
                 'steam_news': [],
                 'github_commits': []
             }
+        
+        # Depot changes are keyed on the build ID alone now
+        data.get('steam_depot', {}).pop('last_hash', None)
+        
+        # Keep only the most recent IDs; deques evict the oldest automatically
+        data['steam_news'] = deque(data.get('steam_news', []), maxlen=MAX_TRACKED_IDS)
+        data['steamdb_changes'] = deque(data.get('steamdb_changes', []), maxlen=MAX_TRACKED_IDS)
+        return data
+    
+    def serialize_tracked_data(self):
+        """Serialize tracked data, writing deques out as plain lists"""
+        return orjson.dumps(self.state.tracked_data, option=orjson.OPT_INDENT_2, default=list)
+    
+    def remember_id(self, key, seen, item_id):
+        """Track an ID in both the bounded deque and its shadow set"""
+        ids = self.state.tracked_data[key]
+        if len(ids) == ids.maxlen:
+            seen.discard(ids[0])
+        ids.append(item_id)
+        seen.add(item_id)
+    
+    def _write_json(self, payload):
+        """Atomically write serialized tracked data to disk"""
+        tmp_path = TRACKED_DATA_FILE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, TRACKED_DATA_FILE)
+    
+    async def _save_worker(self):
+        """Write tracked data at most once per debounce window, off the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._save_dirty.wait()
+            await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+            self._save_dirty.clear()
+            # Serialize on the loop thread so the executor never sees a dict mid-mutation
+            payload = self.serialize_tracked_data()
+            # Shielded so cancelling the worker leaves a running write for close() to await
+            self._pending_write = loop.run_in_executor(None, self._write_json, payload)
+            try:
+                await asyncio.shield(self._pending_write)
+            except OSError as e:
+                logger.exception("❌ Error saving tracked data: %s", e)
+                # Retry in the next debounce window rather than waiting for another change
+                self._save_dirty.set()
     
-    def save_tracked_data(self):
-        """Save tracked update hashes"""
-        with open('tracked_updates.json', 'w') as f:
-            json.dump(self.tracked_data, f, indent=2)
+    async def flush_tracked_data(self):
+        """Stop the save worker, wait for its in-flight write, then save pending changes"""
+        if self._save_task:
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+        
+        if self._pending_write:
+            try:
+                await self._pending_write
+            except OSError:
+                # The final write below retries whatever that write lost
+                self._save_dirty.set()
+        
+        if self._save_dirty.is_set():
+            self._save_dirty.clear()
+            self._write_json(self.serialize_tracked_data())
+    
+    def conditional_headers(self, url):
+        """Build If-None-Match / If-Modified-Since headers from the last response"""
+        headers = {}
+        meta = self.state.http_meta.get(url, {})
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def store_http_meta(self, url, response):
+        """Remember validators for the next poll, once the whole body was handled without error"""
+        # Storing them earlier would hide a failed item behind 304s until the feed changes
+        meta = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        if self.state.http_meta.get(url) != meta:
+            self.state.http_meta[url] = meta
+            self._save_dirty.set()
+    
+    def skip_poll(self, url):
+        """Whether this due poll should be skipped because the endpoint's circuit is open"""
+        breaker = self.state.breakers[url]
+        if breaker['skip'] > 0:
+            breaker['skip'] -= 1
+            return True
+        return False
+    
+    def record_success(self, url):
+        """Close the circuit after a successful request"""
+        self.state.breakers[url]['fails'] = 0
+    
+    def record_failure(self, url):
+        """Count a failed poll and open the circuit once the threshold is hit"""
+        breaker = self.state.breakers[url]
+        breaker['fails'] += 1
+        # The count is kept while open, so a single failed trial poll afterwards reopens it
+        if breaker['fails'] >= _CIRCUIT_FAILURE_THRESHOLD:
+            breaker['skip'] = _CIRCUIT_OPEN_POLLS
+            logger.warning("⚠️ %s keeps failing, skipping its next %d polls", url, _CIRCUIT_OPEN_POLLS)
+    
+    def record_status(self, url, status):
+        """Feed an HTTP status into the circuit breaker (304 counts as success)"""
+        if status in (200, 304):
+            self.record_success(url)
+        else:
+            self.record_failure(url)
+    
+    async def read_capped(self, response):
+        """Read a response body, or return None if it exceeds MAX_RESPONSE_BYTES"""
+        body = None
+        if (response.content_length or 0) <= MAX_RESPONSE_BYTES:
+            # Read in chunks so oversized chunked bodies are caught as well
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                buffer += chunk
+                if len(buffer) > MAX_RESPONSE_BYTES:
+                    break
+            else:
+                body = bytes(buffer)
+        
+        if body is None:
+            logger.warning("⚠️ Ignoring oversized response from %s", response.url)
+        return body
+    
+    def retry_delay(self, response, attempt):
+        """Seconds to wait before retrying, or None if Retry-After asks for longer than we retry"""
+        retry_after = response.headers.get('Retry-After', '').strip()
+        if not retry_after:
+            return min(2 ** attempt + random.random(), HTTP_RETRY_MAX_DELAY)
+        
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            # HTTP-date form; an unparseable value means we can't honor it, so don't retry
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            delay = max((retry_at - discord.utils.utcnow()).total_seconds(), 0.0)
+        
+        # Retrying earlier than the server asked is exactly what Retry-After forbids
+        return delay if delay <= HTTP_RETRY_MAX_DELAY else None
+    
+    async def get_with_retry(self, url, **kwargs):
+        """GET an endpoint, retrying 429/5xx with backoff; returns (response, body or None)"""
+        started = time.monotonic()
+        for attempt in range(HTTP_RETRY_ATTEMPTS):
+            body = None
+            async with self.session.get(url, **kwargs) as response:
+                if response.status == 200:
+                    body = await self.read_capped(response)
+                    break
+                if response.status not in HTTP_RETRY_STATUSES or attempt == HTTP_RETRY_ATTEMPTS - 1:
+                    break
+                delay = self.retry_delay(response, attempt)
+            
+            # Leave the retry to the next poll if the wait would not fit in this one
+            if delay is None or time.monotonic() - started + delay >= SOURCE_TIMEOUT_SECONDS:
+                logger.warning("⚠️ %s returned %s, not retrying until the next poll", url, response.status)
+                break
+            
+            logger.warning("⚠️ %s returned %s, retrying in %.1fs", url, response.status, delay)
+            await asyncio.sleep(delay)
+        
+        self.record_status(url, response.status)
+        return response, body
+    
+    async def get_json(self, url, **kwargs):
+        """Conditionally GET an endpoint; returns (response, decoded JSON or None)"""
+        response, raw = await self.get_with_retry(url, headers=self.conditional_headers(url), **kwargs)
+        
+        # 304 Not Modified, a failed request or an oversized body leaves nothing to do
+        if response.status != 200 or raw is None:
+            return response, None
+        return response, orjson.loads(raw)
     
     async def setup_hook(self):
         """Initialize the bot"""
-        self.session = aiohttp.ClientSession()
-        print("🔍 CS2 Update Tracker Bot Starting...")
+        connector = aiohttp.TCPConnector(
+            limit=20,
+            limit_per_host=4,
+            ttl_dns_cache=3600,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+            headers={'User-Agent': USER_AGENT}
+        )
+        self._save_task = asyncio.create_task(self._save_worker())
+        self._sender_task = asyncio.create_task(self._sender())
+        logger.info("🔍 CS2 Update Tracker Bot Starting...")
         
-        # Start monitoring tasks
-        self.check_steam_depot.start()
-        self.check_steam_news.start()
-        self.check_steamdb.start()
+        # Start monitoring task
+        self.poll_sources.start()
         
     async def close(self):
         """Cleanup on bot shutdown"""
-        if self.session:
-            await self.session.close()
-        await super().close()
+        try:
+            await self.drain_send_queue()
+            # Flush any change still waiting for the debounce window
+            await self.flush_tracked_data()
+        except Exception as e:
+            logger.exception("❌ Error saving tracked data on shutdown: %s", e)
+        finally:
+            if self.session:
+                await self.session.close()
+            await super().close()
+    
+    async def drain_send_queue(self):
+        """Stop polling and post everything already queued before the sender is cancelled"""
+        # Fetched updates are recorded as seen before they are queued, so a tick must not be
+        # cut off between fetching and queueing. Waiting for the tick lock and cancelling while
+        # holding it stops the loop either between ticks or before the next one fetches anything.
+        try:
+            await asyncio.wait_for(self._poll_lock.acquire(), timeout=SEND_DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Polling tick still running at shutdown, cancelling it")
+        self.poll_sources.cancel()
+        
+        if self._sender_task:
+            try:
+                await asyncio.wait_for(self.state.send_queue.join(), timeout=SEND_DRAIN_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Shutting down with %d update(s) still unsent", self.state.send_queue.qsize())
+            self._sender_task.cancel()
     
     async def on_ready(self):
         """Called when bot is ready"""
-        print(f'✅ Bot Online: {self.user.name}')
-        print(f'📊 Monitoring CS2 updates in {len(self.guilds)} server(s)')
+        logger.info('✅ Bot Online: %s', self.user.name)
+        logger.info('📊 Monitoring CS2 updates in %d server(s)', len(self.guilds))
         
         # Set bot status
         await self.change_presence(
@@ -82,161 +415,223 @@ class CS2UpdateBot(commands.Bot):
             )
         )
     
+    async def on_guild_channel_delete(self, channel):
+        """Drop the cached update channel if it was deleted"""
+        if self.state.channel is not None and channel.id == self.state.channel.id:
+            self.state.channel = None
+    
+    async def _sender(self):
+        """Post queued embeds one at a time so Discord rate limits never stall polling"""
+        next_allowed = 0.0
+        while True:
+            embed = await self.state.send_queue.get()
+            try:
+                # Pace sends ourselves rather than tripping Discord's limiter and backing off
+                now = time.monotonic()
+                if now < next_allowed:
+                    await asyncio.sleep(next_allowed - now)
+                next_allowed = max(next_allowed, now) + SEND_INTERVAL_SECONDS
+                await self.send_update(embed)
+            finally:
+                self.state.send_queue.task_done()
+    
     async def send_update(self, embed):
         """Send update to configured channel"""
-        if UPDATE_CHANNEL_ID:
-            try:
-                channel = self.get_channel(UPDATE_CHANNEL_ID)
-                if channel:
-                    await channel.send(embed=embed)
-                    print(f"✅ Sent update to channel: {channel.name}")
-            except Exception as e:
-                print(f"❌ Error sending update: {e}")
-    
-    @tasks.loop(minutes=5)
-    async def check_steam_depot(self):
-        """Check Steam Depot for CS2 updates"""
         try:
-            # SteamDB API - CS2 App ID: 730
-            url = "https://api.steamcmd.net/v1/info/730"
+            if self.state.channel is None:
+                self.state.channel = self.get_channel(UPDATE_CHANNEL_ID)
+            channel = self.state.channel
+            if channel:
+                await channel.send(embed=embed)
+                logger.info("✅ Sent update to channel: %s", channel.name)
+        except Exception as e:
+            logger.exception("❌ Error sending update: %s", e)
+    
+    async def fetch_steam_depot(self):
+        """Check Steam Depot for CS2 updates, returning an embed for a new build"""
+        embeds = []
+        url = STEAM_DEPOT_URL
+        try:
+            # HEAD preflight: an unchanged ETag means there is nothing to download
+            if self.state.depot_head_supported is not False:
+                async with self.session.head(url) as head:
+                    etag = head.headers.get('ETag')
+                    if head.status == 200 and etag:
+                        self.state.depot_head_supported = True
+                        if etag == self.state.http_meta.get(url, {}).get('etag'):
+                            self.record_success(url)
+                            return embeds
+                    elif head.status in (405, 501) or (head.status == 200 and not etag):
+                        self.state.depot_head_supported = False
+                        logger.info("ℹ️ %s gives no ETag on HEAD, using conditional GET only", url)
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
+            response, data = await self.get_json(url)
+            if data is None:
+                return embeds
+            
+            if 'data' in data and '730' in data['data']:
+                depot_info = data['data']['730']
+                build_id = depot_info.get('depots', {}).get('branches', {}).get('public', {}).get('buildid')
+                
+                # The public branch build ID is Valve's version token for a release
+                if build_id and str(build_id) != str(self.state.tracked_data['steam_depot'].get('last_build')):
+                    embed = discord.Embed(
+                        title="🚨 CS2 Steam Depot Update Detected!",
+                        description="A new build has been pushed to Steam",
+                        color=0xFF6B00,
+                        timestamp=discord.utils.utcnow()
+                    )
+                    embed.add_field(name="Build ID", value=f"`{build_id}`", inline=True)
+                    embed.add_field(name="App ID", value="730 (CS2)", inline=True)
+                    embed.add_field(
+                        name="ℹ️ Info",
+                        value="This update was detected through Steam's depot system. Patch notes may follow soon.",
+                        inline=False
+                    )
+                    embed.set_footer(text="CS2 Update Tracker • SteamDB Monitor")
+                    
+                    embeds.append(embed)
+                    self.state.tracked_data['steam_depot']['last_build'] = build_id
+                    self._save_dirty.set()
+            
+            self.store_http_meta(url, response)
                     
-                    if 'data' in data and '730' in data['data']:
-                        depot_info = data['data']['730']
-                        current_hash = hashlib.md5(
-                            json.dumps(depot_info, sort_keys=True).encode()
-                        ).hexdigest()
-                        
-                        # Check if this is a new update
-                        if current_hash != self.tracked_data['steam_depot'].get('last_hash'):
-                            build_id = depot_info.get('depots', {}).get('branches', {}).get('public', {}).get('buildid', 'Unknown')
-                            
-                            embed = discord.Embed(
-                                title="🚨 CS2 Steam Depot Update Detected!",
-                                description="A new build has been pushed to Steam",
-                                color=0xFF6B00,
-                                timestamp=datetime.utcnow()
-                            )
-                            embed.add_field(name="Build ID", value=f"`{build_id}`", inline=True)
-                            embed.add_field(name="App ID", value="730 (CS2)", inline=True)
-                            embed.add_field(
-                                name="ℹ️ Info",
-                                value="This update was detected through Steam's depot system. Patch notes may follow soon.",
-                                inline=False
-                            )
-                            embed.set_footer(text="CS2 Update Tracker • SteamDB Monitor")
-                            
-                            await self.send_update(embed)
-                            
-                            self.tracked_data['steam_depot']['last_hash'] = current_hash
-                            self.tracked_data['steam_depot']['last_build'] = build_id
-                            self.save_tracked_data()
-                            
         except Exception as e:
-            print(f"❌ Error checking Steam Depot: {e}")
+            self.record_failure(url)
+            logger.exception("❌ Error checking Steam Depot: %s", e)
+        
+        return embeds
     
-    @tasks.loop(minutes=10)
-    async def check_steam_news(self):
-        """Check Steam News for CS2 announcements"""
+    async def fetch_steam_news(self):
+        """Check Steam News for CS2 announcements, returning embeds for new items"""
+        embeds = []
+        url = STEAM_NEWS_URL
         try:
-            url = "https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/?appid=730&count=5&format=json"
+            response, data = await self.get_json(url)
+            if data is None:
+                return embeds
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
+            for item in data.get('appnews', {}).get('newsitems', []):
+                news_id = str(item['gid'])
+                
+                if news_id not in self.state.seen_news:
+                    embed = discord.Embed(
+                        title="📰 Official CS2 Steam News",
+                        description=item['title'],
+                        url=item['url'],
+                        color=0x1B2838,
+                        timestamp=datetime.fromtimestamp(item['date'], tz=timezone.utc)
+                    )
+                    
+                    # Clean and truncate contents
+                    contents = MARKUP_RE.sub('', item.get('contents', ''))[:NEWS_SUMMARY_LENGTH]
+                    
+                    if contents:
+                        embed.add_field(name="Summary", value=contents, inline=False)
+                    
+                    embed.add_field(name="Author", value=item.get('author', 'Valve'), inline=True)
+                    embed.set_footer(text="CS2 Update Tracker • Steam News")
+                    
+                    embeds.append(embed)
+                    self.remember_id('steam_news', self.state.seen_news, news_id)
+                    self._save_dirty.set()
+            
+            self.store_http_meta(url, response)
                     
-                    for item in data.get('appnews', {}).get('newsitems', []):
-                        news_id = str(item['gid'])
-                        
-                        if news_id not in self.tracked_data['steam_news']:
-                            embed = discord.Embed(
-                                title="📰 Official CS2 Steam News",
-                                description=item['title'],
-                                url=item['url'],
-                                color=0x1B2838,
-                                timestamp=datetime.fromtimestamp(item['date'])
-                            )
-                            
-                            # Clean and truncate contents
-                            contents = re.sub(r'\[.*?\]', '', item.get('contents', ''))
-                            contents = re.sub(r'<.*?>', '', contents)
-                            contents = contents[:500]
-                            
-                            if contents:
-                                embed.add_field(name="Summary", value=contents, inline=False)
-                            
-                            embed.add_field(name="Author", value=item.get('author', 'Valve'), inline=True)
-                            embed.set_footer(text="CS2 Update Tracker • Steam News")
-                            
-                            await self.send_update(embed)
-                            self.tracked_data['steam_news'].append(news_id)
-                            
-                            # Keep only last 50 tracked news
-                            if len(self.tracked_data['steam_news']) > 50:
-                                self.tracked_data['steam_news'] = self.tracked_data['steam_news'][-50:]
-                            
-                            self.save_tracked_data()
-                            
         except Exception as e:
-            print(f"❌ Error checking Steam News: {e}")
+            self.record_failure(url)
+            logger.exception("❌ Error checking Steam News: %s", e)
+        
+        return embeds
     
-    @tasks.loop(minutes=15)
-    async def check_steamdb(self):
-        """Check SteamDB changes page"""
+    async def fetch_steamdb(self):
+        """Check SteamDB changes page, returning embeds for new changes"""
+        embeds = []
+        url = STEAMDB_URL
         try:
-            # This monitors the SteamDB changes feed
-            url = "https://steamdb.info/api/GetAppHistoryItems/"
-            
             params = {
                 'appid': 730,
                 'itemsPerPage': 5
             }
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
+            response, data = await self.get_json(url, params=params)
+            if data is None:
+                return embeds
+            
+            # Process SteamDB changes
+            for change in data.get('data', [])[:3]:
+                change_id = str(change.get('ChangeID', ''))
+                
+                if change_id and change_id not in self.state.seen_changes:
+                    embed = discord.Embed(
+                        title="🔧 SteamDB: CS2 Database Change",
+                        description="A change has been detected in CS2's Steam database",
+                        url=f"https://steamdb.info/app/730/history/",
+                        color=0x2A3F5F,
+                        timestamp=discord.utils.utcnow()
+                    )
+                    
+                    embed.add_field(name="Change ID", value=f"`{change_id}`", inline=True)
+                    embed.add_field(name="Type", value=change.get('Type', 'Unknown'), inline=True)
+                    embed.set_footer(text="CS2 Update Tracker • SteamDB Monitor")
+                    
+                    embeds.append(embed)
+                    self.remember_id('steamdb_changes', self.state.seen_changes, change_id)
+                    self._save_dirty.set()
+            
+            self.store_http_meta(url, response)
                     
-                    # Process SteamDB changes
-                    for change in data.get('data', [])[:3]:
-                        change_id = str(change.get('ChangeID', ''))
-                        
-                        if change_id and change_id not in self.tracked_data.get('steamdb_changes', []):
-                            embed = discord.Embed(
-                                title="🔧 SteamDB: CS2 Database Change",
-                                description="A change has been detected in CS2's Steam database",
-                                url=f"https://steamdb.info/app/730/history/",
-                                color=0x2A3F5F,
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            embed.add_field(name="Change ID", value=f"`{change_id}`", inline=True)
-                            embed.add_field(name="Type", value=change.get('Type', 'Unknown'), inline=True)
-                            embed.set_footer(text="CS2 Update Tracker • SteamDB Monitor")
-                            
-                            await self.send_update(embed)
-                            
-                            if 'steamdb_changes' not in self.tracked_data:
-                                self.tracked_data['steamdb_changes'] = []
-                            
-                            self.tracked_data['steamdb_changes'].append(change_id)
-                            
-                            # Keep only last 50
-                            if len(self.tracked_data['steamdb_changes']) > 50:
-                                self.tracked_data['steamdb_changes'] = self.tracked_data['steamdb_changes'][-50:]
-                            
-                            self.save_tracked_data()
-                            
         except Exception as e:
-            print(f"❌ Error checking SteamDB: {e}")
+            self.record_failure(url)
+            logger.exception("❌ Error checking SteamDB: %s", e)
+        
+        return embeds
+    
+    @tasks.loop(minutes=1)
+    async def poll_sources(self):
+        """Run one polling tick under the tick lock"""
+        async with self._poll_lock:
+            await self.poll_due_sources()
+    
+    async def poll_due_sources(self):
+        """Fetch every due source concurrently, then queue their updates in order"""
+        # Scheduling counts ticks rather than wall time, so a tick that wakes a little early
+        # can't push a poll back a whole minute
+        tick = self.poll_sources.current_loop
+        due = [
+            name for name, (interval, url, fetch) in self.sources.items()
+            if tick >= self.state.next_poll[name]
+        ]
+        if not due:
+            return
+        
+        for name in due:
+            self.state.next_poll[name] = tick + self.sources[name][0]
+        
+        # Skip endpoints whose circuit is open; they get a trial poll once the skips run out
+        due = [name for name in due if not self.skip_poll(self.sources[name][1])]
+        if not due:
+            return
+        
+        # A slow or hanging source only costs its own timeout, not the others
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self.sources[name][2](), timeout=SOURCE_TIMEOUT_SECONDS) for name in due),
+            return_exceptions=True
+        )
+        
+        for name, result in zip(due, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.record_failure(self.sources[name][1])
+                logger.error("❌ Timed out checking %s", name)
+            elif isinstance(result, BaseException):
+                logger.error("❌ Error checking %s: %s", name, result, exc_info=result)
+            else:
+                for embed in result:
+                    await self.state.send_queue.put(embed)
     
-    @check_steam_depot.before_loop
-    @check_steam_news.before_loop
-    @check_steamdb.before_loop
-    async def before_tasks(self):
-        """Wait until bot is ready before starting tasks"""
+    @poll_sources.before_loop
+    async def before_poll_sources(self):
+        """Wait until bot is ready before polling"""
         await self.wait_until_ready()
 
 # Commands
@@ -288,11 +683,16 @@ async def help_command(ctx):
 
 # Initialize and run bot
 if __name__ == "__main__":
+    log_listener = setup_logging()
+    
     bot = CS2UpdateBot()
     bot.add_command(status)
     bot.add_command(help_command)
     
     try:
-        bot.run(DISCORD_TOKEN)
+        # log_handler=None lets discord.py's records propagate to the queued root handler
+        bot.run(DISCORD_TOKEN, log_handler=None)
     except Exception as e:
-        print(f"❌ Error starting bot: {e}")
+        logger.exception("❌ Error starting bot: %s", e)
+    finally:
+        log_listener.stop()